@@ -2,7 +2,10 @@
 Authentication module for the DevOps Agent
 """
 
+import functools
 import hashlib
+import heapq
+import re
 import secrets
 import time
 from datetime import datetime, timedelta
@@ -16,64 +19,126 @@ from models import AuthMethod, AuthRequest, AuthResponse
 from logger import logger
 from config import AUTH_TOKEN_SECRET, AUTHORIZED_KEYS_FILE
 
+# Matches "<key-type> <base64-data> [comment]" entries in authorized_keys,
+# applied to the raw bytes so parsing is one C-level pass over the file
+AUTHORIZED_KEY_RE = re.compile(
+    rb'^([!-~]+)[ \t]+([A-Za-z0-9+/=]+)(?:[ \t]+(\S+))?', re.MULTILINE
+)
+
+# Session lifetime, in nanoseconds for monotonic-clock comparisons
+SESSION_LIFETIME_NS = 24 * 3600 * 1_000_000_000
+
+# Number of session shards; must be a power of two for the mask below
+SESSION_SHARD_COUNT = 16
+
+# Grace window for reusing a validated session without re-checking expiry
+SESSION_VALIDATION_TTL = 5.0  # seconds
+SESSION_VALIDATION_CACHE_SIZE = 10_000
+
+@functools.lru_cache(maxsize=256)
+def _canonicalize_ssh_key(raw: str) -> bytes:
+    """Digest of the normalized 'type data' pair of an SSH key, ignoring any comment
+
+    Memoized so repeated auth attempts with the same key skip the reparse.
+    """
+    parts = raw.strip().split()
+    canonical = " ".join(parts[:2]) if len(parts) >= 2 else raw.strip()
+    return hashlib.sha256(canonical.encode()).digest()
+
+@functools.cache
+def _compute_api_tokens(secret: str) -> Dict[str, bytes]:
+    """Compute the demo API token table once per secret (in production, this would be from a database)
+
+    Tokens are stored as ASCII bytes so compare_digest runs on the fast
+    bytes path without re-encoding the stored side per call. Truncating
+    the raw digest before hex-encoding yields the same 32-character token
+    as hexdigest()[:32] without formatting the full digest first.
+    """
+    secret_b = secret.encode()
+    return {
+        user: hashlib.sha256(user.encode() + b'-' + secret_b).digest()[:16].hex().encode('ascii')
+        for user in ("admin", "devops", "user")
+    }
+
 class AuthManager:
     """Handles user authentication via SSH keys or API tokens"""
     
     def __init__(self):
-        self.active_sessions: Dict[str, dict] = {}
-        self.api_tokens = self._load_api_tokens()
-        self.ssh_keys = self._load_ssh_keys()
-    
-    def _load_api_tokens(self) -> Dict[str, str]:
-        """Load valid API tokens (in production, this would be from a database)"""
-        # For demo purposes, generate some default tokens
-        return {
-            "admin": hashlib.sha256(f"admin-{AUTH_TOKEN_SECRET}".encode()).hexdigest()[:32],
-            "devops": hashlib.sha256(f"devops-{AUTH_TOKEN_SECRET}".encode()).hexdigest()[:32],
-            "user": hashlib.sha256(f"user-{AUTH_TOKEN_SECRET}".encode()).hexdigest()[:32]
+        # Sessions sharded by id prefix so concurrent tasks mostly touch
+        # different dicts and each bucket's working set stays small
+        self._session_shards: list = [dict() for _ in range(SESSION_SHARD_COUNT)]
+        self.api_tokens = _compute_api_tokens(AUTH_TOKEN_SECRET)
+        # Reverse index for O(1) token lookup instead of scanning every user
+        self._token_index: Dict[bytes, str] = {
+            token: username for username, token in self.api_tokens.items()
         }
-    
-    def _load_ssh_keys(self) -> Dict[str, str]:
-        """Load authorized SSH public keys"""
+        # Min-heap of (expires_at, session_id) so expired sessions are
+        # reaped in O(k) instead of scanning every active session
+        self._expiry_heap: list = []
+        # Short-TTL cache of validated sessions so hot sessions skip the
+        # expiry check and last_activity churn on every request
+        self._validation_cache: Dict[str, tuple] = {}
+
+    @functools.cached_property
+    def ssh_keys(self) -> Dict[str, str]:
+        """Authorized SSH public keys, loaded from disk on first access"""
         ssh_keys = {}
-        
+
         if AUTHORIZED_KEYS_FILE.exists():
             try:
-                with open(AUTHORIZED_KEYS_FILE, 'r') as f:
-                    for line_num, line in enumerate(f):
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                key_type, key_data = parts[0], parts[1]
-                                # Use line number as username if not specified
-                                username = parts[2] if len(parts) > 2 else f"user_{line_num}"
-                                ssh_keys[username] = f"{key_type} {key_data}"
+                data = AUTHORIZED_KEYS_FILE.read_bytes()
+                for entry_num, match in enumerate(AUTHORIZED_KEY_RE.finditer(data)):
+                    key_type, key_data, comment = match.groups()
+                    if key_type.startswith(b'#'):
+                        continue
+                    # Use entry number as username if no comment is present
+                    username = comment.decode() if comment else f"user_{entry_num}"
+                    ssh_keys[username] = f"{key_type.decode()} {key_data.decode()}"
             except Exception as e:
                 logger.error("Failed to load SSH keys", error=str(e))
-        
+
         # Add a default key for testing
         if not ssh_keys:
             ssh_keys["demo"] = "ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAABgQC... demo@localhost"
-        
+
         return ssh_keys
+
+    @functools.cached_property
+    def _ssh_key_index(self) -> Dict[bytes, str]:
+        """Hash index for O(1) SSH key lookup without early-exit comparisons"""
+        return {
+            _canonicalize_ssh_key(stored_key): username
+            for username, stored_key in self.ssh_keys.items()
+        }
     
     def _validate_ssh_key(self, provided_key: str) -> Optional[str]:
         """Validate SSH public key and return username if valid"""
-        provided_key = provided_key.strip()
-        
-        for username, stored_key in self.ssh_keys.items():
-            if provided_key == stored_key or provided_key in stored_key:
-                return username
-        
+        key_hash = _canonicalize_ssh_key(provided_key)
+        username = self._ssh_key_index.get(key_hash)
+        if username is None:
+            return None
+
+        # Constant-time check against the stored key's digest for the matched entry
+        if secrets.compare_digest(key_hash, _canonicalize_ssh_key(self.ssh_keys[username])):
+            return username
+
         return None
     
     def _validate_api_token(self, token: str) -> Optional[str]:
         """Validate API token and return username if valid"""
-        for username, stored_token in self.api_tokens.items():
-            if secrets.compare_digest(token, stored_token):
-                return username
-        
+        try:
+            provided = token.encode('ascii')
+        except UnicodeEncodeError:
+            return None
+
+        username = self._token_index.get(provided)
+        if username is None:
+            return None
+
+        # Constant-time check against the stored value for the matched entry
+        if secrets.compare_digest(provided, self.api_tokens[username]):
+            return username
+
         return None
     
     def authenticate(self, auth_request: AuthRequest) -> AuthResponse:
@@ -97,18 +162,23 @@ class AuthManager:
                 message="Invalid credentials"
             )
         
-        # Create session
+        # Create session; datetimes are built once here for the API
+        # boundary while the hot path compares monotonic nanoseconds
         session_id = secrets.token_urlsafe(32)
-        expires_at = datetime.utcnow() + timedelta(hours=24)
-        
-        self.active_sessions[session_id] = {
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=24)
+        expires_at_ns = time.monotonic_ns() + SESSION_LIFETIME_NS
+
+        self._shard(session_id)[session_id] = {
             "username": username,
             "auth_method": auth_request.method,
-            "created_at": datetime.utcnow(),
+            "created_at": now,
             "expires_at": expires_at,
-            "last_activity": datetime.utcnow()
+            "expires_at_ns": expires_at_ns,
+            "last_activity": now
         }
-        
+        heapq.heappush(self._expiry_heap, (expires_at_ns, session_id))
+
         logger.audit(
             "authentication_success",
             session_id=session_id,
@@ -123,45 +193,78 @@ class AuthManager:
             expires_at=expires_at
         )
     
+    def _shard(self, session_id: str) -> dict:
+        """Select the session bucket for a session id"""
+        if not session_id:
+            return self._session_shards[0]
+        return self._session_shards[ord(session_id[0]) & (SESSION_SHARD_COUNT - 1)]
+
+    def _reap_expired(self):
+        """Remove sessions whose expiry has passed, cheapest-first via the heap"""
+        now_ns = time.monotonic_ns()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now_ns:
+            expires_at_ns, session_id = heapq.heappop(self._expiry_heap)
+            shard = self._shard(session_id)
+            session = shard.get(session_id)
+            # Guard against session ids that were reissued or already removed
+            if session and now_ns > session["expires_at_ns"]:
+                del shard[session_id]
+                self._validation_cache.pop(session_id, None)
+                logger.audit("session_expired", session_id=session_id)
+
     def validate_session(self, session_id: str) -> Optional[dict]:
         """Validate session and return session info if valid"""
-        if session_id not in self.active_sessions:
+        now_mono = time.monotonic()
+
+        # Hot path: session validated within the grace window
+        cached = self._validation_cache.get(session_id)
+        if cached and cached[0] > now_mono:
+            return cached[1]
+
+        self._reap_expired()
+
+        shard = self._shard(session_id)
+        session = shard.get(session_id)
+        if session is None:
             return None
-        
-        session = self.active_sessions[session_id]
-        
-        # Check expiration
-        if datetime.utcnow() > session["expires_at"]:
-            del self.active_sessions[session_id]
+
+        # Check expiration via the monotonic clock; no datetime allocation
+        if time.monotonic_ns() > session["expires_at_ns"]:
+            del shard[session_id]
+            self._validation_cache.pop(session_id, None)
             logger.audit("session_expired", session_id=session_id)
             return None
-        
-        # Update last activity
+
+        # Update last activity (at most once per TTL window thanks to the cache)
         session["last_activity"] = datetime.utcnow()
-        
+
+        if len(self._validation_cache) >= SESSION_VALIDATION_CACHE_SIZE:
+            self._validation_cache = {
+                sid: entry for sid, entry in self._validation_cache.items()
+                if entry[0] > now_mono
+            }
+        self._validation_cache[session_id] = (now_mono + SESSION_VALIDATION_TTL, session)
+
         return session
     
     def logout(self, session_id: str) -> bool:
         """Logout user and invalidate session"""
-        if session_id in self.active_sessions:
-            username = self.active_sessions[session_id]["username"]
-            del self.active_sessions[session_id]
+        shard = self._shard(session_id)
+        if session_id in shard:
+            username = shard[session_id]["username"]
+            del shard[session_id]
+            self._validation_cache.pop(session_id, None)
             logger.audit("logout", session_id=session_id, username=username)
             return True
         return False
     
     def get_active_sessions(self) -> Dict[str, dict]:
         """Get all active sessions (for admin purposes)"""
-        # Clean expired sessions
-        now = datetime.utcnow()
-        expired_sessions = [
-            sid for sid, session in self.active_sessions.items()
-            if now > session["expires_at"]
-        ]
-        for sid in expired_sessions:
-            del self.active_sessions[sid]
-        
-        return self.active_sessions.copy()
+        self._reap_expired()
+        sessions: Dict[str, dict] = {}
+        for shard in self._session_shards:
+            sessions.update(shard)
+        return sessions
 
 # Global auth manager instance
 auth_manager = AuthManager()
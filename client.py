@@ -2,51 +2,97 @@
 Terminal client for the DevOps Agent
 """
 
-import json
 import sys
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+import orjson
 import requests
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-from rich import box
+from requests.adapters import HTTPAdapter
+
+# Rich's import graph is large; submodules are imported lazily inside the
+# methods that render with them to keep client startup fast
 
 from models import AuthMethod, AuthRequest, CommandRequest
 from config import CLIENT_HOST, CLIENT_PORT
 
+# Checked on every interactive loop iteration; frozensets give O(1) membership
+EXIT_COMMANDS = frozenset({"exit", "quit", "logout"})
+DANGEROUS_COMMANDS = frozenset({"rm", "delete", "format", "reboot"})
+
 class DevOpsTerminalClient:
     """Terminal client for interacting with the DevOps Agent"""
-    
+
+    # Column definitions hoisted to class scope so per-call table builds
+    # don't re-create the style keyword dicts
+    HISTORY_COLUMNS = (
+        ("#", {"style": "cyan", "width": 4}),
+        ("Command", {"style": "white"}),
+        ("Status", {"style": "green"}),
+        ("Exit Code", {"style": "yellow", "width": 10}),
+        ("Time", {"style": "blue", "width": 8}),
+        ("Timestamp", {"style": "dim", "width": 20}),
+    )
+
     def __init__(self, host: str = CLIENT_HOST, port: int = CLIENT_PORT):
+        from rich.console import Console
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         self.console = Console()
         self.base_url = f"http://{host}:{port}"
         self.session_id: Optional[str] = None
         self.username: Optional[str] = None
-        
+
+        # Pooled session: keep-alive connections are reused across requests
+        # instead of paying a new TCP handshake per call
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+        # Validated once; per-command requests patch in the varying fields
+        # via model_copy instead of re-validating the defaults every time
+        self._command_template = CommandRequest(session_id="", command="")
+
+        # Reusable renderable setup: one spinner instance shared by all
+        # requests and cached panel styles for the per-command output
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+            transient=True
+        )
+        self._output_panel_style = {"title": "📤 Output", "border_style": "green", "expand": False}
+        self._error_panel_style = {"title": "⚠️ Error Output", "border_style": "red", "expand": False}
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[Any, Any]]:
         """Make HTTP request to the server"""
         url = f"{self.base_url}{endpoint}"
-        
+        kwargs.setdefault("timeout", (3, 30))
+
+        # Serialize outbound payloads with orjson so call-sites can keep
+        # passing json=...; decoding also goes through orjson directly
+        # from the response bytes
+        payload = kwargs.pop("json", None)
+        if payload is not None:
+            kwargs["data"] = orjson.dumps(payload)
+            kwargs.setdefault("headers", {})["Content-Type"] = "application/json"
+
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._http.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             self.console.print(f"[red]Request failed: {e}[/red]")
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.console.print(f"[red]Invalid JSON response: {e}[/red]")
             return None
     
     def display_welcome(self):
         """Display welcome message"""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         welcome_text = """
 # 🚀 DevOps Terminal Agent
 
@@ -80,6 +126,8 @@ Ready to get started? Let's authenticate you first! 🎯
     
     def authenticate(self) -> bool:
         """Handle user authentication"""
+        from rich.prompt import Prompt
+
         self.console.print("\n[bold blue]🔐 Authentication Required[/bold blue]")
         
         # Choose authentication method
@@ -126,25 +174,43 @@ Ready to get started? Let's authenticate you first! 🎯
             username=username if username else None
         )
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
-            task = progress.add_task("Authenticating...", total=None)
-            
+        with self._progress:
+            task = self._progress.add_task("Authenticating...", total=None)
+
             response = self._make_request(
                 "POST",
                 "/auth/login",
-                json=auth_request.dict()
+                json=auth_request.model_dump(mode="json")
             )
-            
-            progress.remove_task(task)
-        
+
+            self._progress.remove_task(task)
+
+        return self._handle_auth_response(response, username)
+
+    def authenticate_with(self, method: AuthMethod, credentials: str,
+                          username: Optional[str] = None) -> bool:
+        """Authenticate non-interactively, for scripted usage"""
+        auth_request = AuthRequest(
+            method=method,
+            credentials=credentials,
+            username=username
+        )
+
+        response = self._make_request(
+            "POST",
+            "/auth/login",
+            json=auth_request.model_dump(mode="json")
+        )
+
+        return self._handle_auth_response(response, username)
+
+    def _handle_auth_response(self, response: Optional[Dict[Any, Any]],
+                              username: Optional[str]) -> bool:
+        """Record the session from an auth response and report the outcome"""
         if response and response.get("success"):
             self.session_id = response.get("session_id")
             self.username = username or "user"
-            
+
             self.console.print(f"\n[green]✅ {response.get('message')}[/green]")
             self.console.print(f"[dim]Session expires: {response.get('expires_at', 'Unknown')}[/dim]")
             return True
@@ -152,7 +218,7 @@ Ready to get started? Let's authenticate you first! 🎯
             error_msg = response.get("message", "Authentication failed") if response else "Connection failed"
             self.console.print(f"\n[red]❌ {error_msg}[/red]")
             return False
-    
+
     def display_sandbox_info(self):
         """Display sandbox environment information"""
         if not self.session_id:
@@ -165,8 +231,11 @@ Ready to get started? Let's authenticate you first! 🎯
         )
         
         if response:
+            from rich import box
+            from rich.table import Table
+
             self.console.print("\n[bold green]📦 Sandbox Environment[/bold green]")
-            
+
             table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
             table.add_column("Property", style="cyan")
             table.add_column("Value", style="white")
@@ -192,6 +261,8 @@ Ready to get started? Let's authenticate you first! 🎯
     
     def execute_command_interactive(self):
         """Interactive command execution"""
+        from rich.prompt import Confirm, Prompt
+
         if not self.session_id:
             self.console.print("[red]Not authenticated![/red]")
             return
@@ -204,7 +275,7 @@ Ready to get started? Let's authenticate you first! 🎯
             if not command_input:
                 continue
             
-            if command_input.lower() in ["exit", "quit", "logout"]:
+            if command_input.casefold() in EXIT_COMMANDS:
                 break
             
             if command_input.lower() == "help":
@@ -225,7 +296,7 @@ Ready to get started? Let's authenticate you first! 🎯
             args = parts[1:] if len(parts) > 1 else []
             
             # Confirm execution for potentially dangerous commands
-            if command.lower() in ["rm", "delete", "format", "reboot"]:
+            if command.casefold() in DANGEROUS_COMMANDS:
                 if not Confirm.ask(f"[yellow]⚠️  Execute potentially dangerous command '{command_input}'?[/yellow]"):
                     continue
             
@@ -234,32 +305,28 @@ Ready to get started? Let's authenticate you first! 🎯
     
     def execute_command(self, command: str, args: list):
         """Execute a single command"""
+        from rich.panel import Panel
+
         if not self.session_id:
             return
         
-        command_request = CommandRequest(
-            session_id=self.session_id,
-            command=command,
-            args=args
+        command_request = self._command_template.model_copy(
+            update={"session_id": self.session_id, "command": command, "args": args}
         )
         
         self.console.print(f"\n[dim]Executing: {command} {' '.join(args)}[/dim]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console
-        ) as progress:
-            task = progress.add_task("Running command...", total=None)
-            
+        with self._progress:
+            task = self._progress.add_task("Running command...", total=None)
+
             response = self._make_request(
                 "POST",
                 "/commands/execute",
                 params={"session_id": self.session_id},
-                json=command_request.dict()
+                json=command_request.model_dump(mode="json")
             )
-            
-            progress.remove_task(task)
+
+            self._progress.remove_task(task)
         
         if response:
             status = response.get("status", "unknown")
@@ -282,28 +349,28 @@ Ready to get started? Let's authenticate you first! 🎯
             stderr = response.get("stderr", "")
             
             if stdout:
-                self.console.print(Panel(
-                    stdout,
-                    title="📤 Output",
-                    border_style="green",
-                    expand=False
-                ))
-            
+                self.console.print(Panel(stdout, **self._output_panel_style))
+
             if stderr:
-                self.console.print(Panel(
-                    stderr,
-                    title="⚠️ Error Output",
-                    border_style="red",
-                    expand=False
-                ))
+                self.console.print(Panel(stderr, **self._error_panel_style))
             
             # Resource usage
             resource_usage = response.get("resource_usage", {})
             if resource_usage:
-                self.console.print(f"[dim]Resources: CPU: {resource_usage.get('cpu_time', 'N/A')}, "
-                                 f"Memory: {resource_usage.get('memory_peak', 'N/A')}, "
-                                 f"Disk I/O: {resource_usage.get('disk_io', 'N/A')}[/dim]")
+                self.console.print(f"[dim]Resources: CPU: {resource_usage.get('cpu_time', 'N/A')}s, "
+                                 f"Memory: {resource_usage.get('memory_peak_kb', 'N/A')} KB, "
+                                 f"Block I/O: {resource_usage.get('block_io', 'N/A')}[/dim]")
     
+    def _build_history_table(self):
+        """Build a fresh history table from the class-level column definitions"""
+        from rich import box
+        from rich.table import Table
+
+        table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
+        for header, kwargs in self.HISTORY_COLUMNS:
+            table.add_column(header, **kwargs)
+        return table
+
     def show_command_history(self):
         """Display command execution history"""
         if not self.session_id:
@@ -312,7 +379,7 @@ Ready to get started? Let's authenticate you first! 🎯
         response = self._make_request(
             "GET",
             "/commands/history",
-            params={"session_id": self.session_id, "limit": 20}
+            params={"session_id": self.session_id, "limit": 10}
         )
         
         if response:
@@ -322,15 +389,9 @@ Ready to get started? Let's authenticate you first! 🎯
                 self.console.print("[dim]No commands executed yet.[/dim]")
                 return
             
-            table = Table(show_header=True, header_style="bold magenta", box=box.ROUNDED)
-            table.add_column("#", style="cyan", width=4)
-            table.add_column("Command", style="white")
-            table.add_column("Status", style="green")
-            table.add_column("Exit Code", style="yellow", width=10)
-            table.add_column("Time", style="blue", width=8)
-            table.add_column("Timestamp", style="dim", width=20)
-            
-            for i, cmd in enumerate(response[-10:], 1):  # Show last 10 commands
+            table = self._build_history_table()
+
+            for i, cmd in enumerate(response, 1):  # Server already limits to 10
                 status = cmd.get("status", "unknown")
                 status_color = "green" if status == "completed" else "red"
                 
@@ -350,6 +411,9 @@ Ready to get started? Let's authenticate you first! 🎯
     
     def show_help(self):
         """Display help information"""
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         help_text = """
 # 🔧 DevOps Agent Help
 
@@ -365,3 +429,58 @@ docker ps                     # List running containers
 kubectl get pods             # List Kubernetes pods
 terraform plan               # Show infrastructure changes
 curl https://api.github.com  # Make HTTP request
+```
+
+## Tips:
+- Commands run in a **simulated sandbox** - no real system changes
+- Use `history` to review past commands
+- Use `sandbox` to inspect your environment
+- Type `exit` to end the session
+        """
+        
+        self.console.print(Panel(
+            Markdown(help_text),
+            title="📖 Help",
+            border_style="cyan",
+            padding=(1, 2)
+        ))
+    
+    def logout(self):
+        """Logout and cleanup session"""
+        if not self.session_id:
+            return
+        
+        response = self._make_request(
+            "POST",
+            "/auth/logout",
+            params={"session_id": self.session_id}
+        )
+        
+        if response and response.get("success"):
+            self.console.print("\n[green]✅ Logged out successfully[/green]")
+        
+        self.session_id = None
+        self.username = None
+    
+    def run(self, auth_method: Optional[AuthMethod] = None,
+            credentials: Optional[str] = None,
+            username: Optional[str] = None):
+        """Main client loop"""
+        self.display_welcome()
+
+        if auth_method and credentials:
+            authenticated = self.authenticate_with(auth_method, credentials, username)
+        else:
+            authenticated = self.authenticate()
+
+        if not authenticated:
+            self.console.print("\n[red]Authentication failed. Exiting.[/red]")
+            return
+        
+        self.display_sandbox_info()
+        
+        try:
+            self.execute_command_interactive()
+        finally:
+            self.logout()
+            self.console.print("\n[blue]Goodbye! 👋[/blue]")
@@ -3,6 +3,7 @@ Configuration settings for the DevOps Agent
 """
 
 import os
+import re
 from pathlib import Path
 
 # Server Configuration
@@ -30,6 +31,11 @@ MAX_PROCESSES = int(os.getenv("MAX_PROCESSES", "10"))
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_FILE = os.getenv("LOG_FILE", "devops_agent.log")
+# Flush the log file after every record instead of batching writes
+AUDIT_SYNC = os.getenv("AUDIT_SYNC", "false").lower() in ("1", "true", "yes")
+# Cap on audit records queued for the background writer; once reached,
+# new records are dropped rather than blocking the request thread
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
 
 # Available DevOps Tools (simulated/safe versions)
 AVAILABLE_TOOLS = [
@@ -38,9 +44,22 @@ AVAILABLE_TOOLS = [
     "grep", "awk", "sed", "find", "cat", "ls", "pwd"
 ]
 
+# Shared immutable view for O(1) availability checks; sandboxes reference
+# this instead of copying the list per session
+AVAILABLE_TOOLS_SET = frozenset(AVAILABLE_TOOLS)
+
 # Blocked Commands (for security)
 BLOCKED_COMMANDS = [
     "rm", "rmdir", "delete", "format", "fdisk",
     "mkfs", "mount", "umount", "reboot", "shutdown",
     "systemctl", "service", "kill", "killall"
 ]
+
+# Frozenset for O(1) membership checks on the command-execution hot path
+BLOCKED_COMMAND_SET = frozenset(BLOCKED_COMMANDS)
+
+# Precompiled anchored alternation over the blocked names, for callers
+# that match a single token; the hot path uses the frozenset directly
+BLOCKED_COMMAND_RE = re.compile(
+    r'^(?:' + '|'.join(map(re.escape, BLOCKED_COMMANDS)) + r')$'
+)
@@ -2,13 +2,61 @@
 Logging configuration and utilities for the DevOps Agent
 """
 
+import functools
+import itertools
 import json
 import logging
+import queue
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from config import AUDIT_QUEUE_MAX, AUDIT_SYNC
+
+@functools.lru_cache(maxsize=128)
+def _audit_event(event: str) -> str:
+    """Cache the formatted audit event names; the set of events is small and hot"""
+    return f"AUDIT: {event}"
+
+class JsonFormatter(logging.Formatter):
+    """Formatter that serializes the structured event attached to a record"""
+
+    def format(self, record):
+        entry = getattr(record, "structured", None)
+        if entry is None:
+            return record.getMessage()
+        return json.dumps(entry)
+
+class BufferedFileHandler(logging.FileHandler):
+    """File handler that batches writes instead of flushing per record
+
+    StreamHandler.emit flushes after every record, paying a syscall per
+    log line. Records here accumulate in a 64KB stream buffer and reach
+    disk when the buffer fills or the periodic flusher thread runs.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        # Per-record flush from emit() is intentionally a no-op; see flush_now
+        pass
+
+    def flush_now(self):
+        """Flush buffered records to disk; called by the flusher thread"""
+        with self.lock:
+            if self.stream:
+                self.stream.flush()
+
+    def close(self):
+        self.flush_now()
+        super().close()
+
 class StructuredLogger:
     """Custom logger that outputs both structured JSON and human-readable logs"""
     
@@ -24,13 +72,47 @@ class StructuredLogger:
         console_handler.setFormatter(console_formatter)
         self.logger.addHandler(console_handler)
         
-        # File handler for structured JSON logs
+        # File handler for structured JSON logs; serialization happens in
+        # the formatter so only the file sink pays for json.dumps. Writes
+        # are buffered unless AUDIT_SYNC forces per-record flushing.
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            if AUDIT_SYNC:
+                file_handler = logging.FileHandler(log_file)
+            else:
+                file_handler = BufferedFileHandler(log_file)
+                threading.Thread(
+                    target=self._flush_loop,
+                    args=(file_handler,),
+                    daemon=True,
+                    name=f"{name}-log-flusher"
+                ).start()
+            file_handler.setFormatter(JsonFormatter())
             self.logger.addHandler(file_handler)
         
-        self.json_logs = []
-    
+        # Bounded ring buffer: O(1) append with automatic eviction
+        self.json_logs = deque(maxlen=1000)
+
+        # Audit records are handed to a background writer so the request
+        # thread only pays for an enqueue; AUDIT_SYNC keeps the old
+        # synchronous path for environments that need write-before-reply
+        self._audit_queue: Optional[queue.SimpleQueue] = None
+        self._audit_dropped = 0
+        self._audit_drop_warned_at = 0.0
+        if not AUDIT_SYNC:
+            self._audit_queue = queue.SimpleQueue()
+            threading.Thread(
+                target=self._audit_writer,
+                daemon=True,
+                name=f"{name}-audit-writer"
+            ).start()
+
+    @staticmethod
+    def _flush_loop(handler: BufferedFileHandler, interval: float = 0.1):
+        """Flush the buffered file handler on a fixed interval"""
+        while True:
+            time.sleep(interval)
+            handler.flush_now()
+
     def log_structured(self, level: str, event: str, **kwargs):
         """Log a structured event with additional metadata"""
         log_entry = {
@@ -40,18 +122,31 @@ class StructuredLogger:
             **kwargs
         }
         
-        # Store in memory for API access
-        self.json_logs.append(log_entry)
-        
-        # Keep only last 1000 logs in memory
-        if len(self.json_logs) > 1000:
-            self.json_logs = self.json_logs[-1000:]
-        
-        # Log to file as JSON
-        json_str = json.dumps(log_entry)
-        getattr(self.logger, level.lower())(json_str)
-        
+        self._emit(level.lower(), log_entry)
         return log_entry
+
+    def _emit(self, level: str, log_entry: Dict[str, Any]):
+        """Record an entry in memory and hand it to the logging handlers
+
+        Console gets the human-readable event; the file formatter picks up
+        the dict from `extra` and JSON-encodes it once. The deque evicts
+        past 1000 entries.
+        """
+        self.json_logs.append(log_entry)
+        getattr(self.logger, level)(log_entry["event"], extra={"structured": log_entry})
+
+    def _audit_writer(self):
+        """Drain queued audit records in batches on a daemon thread"""
+        q = self._audit_queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < 256:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            for log_entry in batch:
+                self._emit("info", log_entry)
     
     def info(self, message: str, **kwargs):
         return self.log_structured("info", message, **kwargs)
@@ -67,17 +162,46 @@ class StructuredLogger:
     
     def audit(self, event: str, session_id: str, **kwargs):
         """Log audit events for security and compliance"""
-        return self.log_structured(
-            "info", 
-            f"AUDIT: {event}", 
-            session_id=session_id,
-            audit=True,
+        # Patch the dynamic fields into the existing kwargs dict instead of
+        # building another one to splat through log_structured
+        kwargs["session_id"] = session_id
+        kwargs["audit"] = True
+
+        if self._audit_queue is None:
+            return self.log_structured("info", _audit_event(event), **kwargs)
+
+        # Drop rather than block or grow without bound when the writer
+        # falls behind; the request thread never waits on logging IO.
+        # Drops are counted and surfaced through a rate-limited warning
+        # so the loss is visible to operators.
+        if AUDIT_QUEUE_MAX and self._audit_queue.qsize() >= AUDIT_QUEUE_MAX:
+            self._audit_dropped += 1
+            now = time.monotonic()
+            if now - self._audit_drop_warned_at >= 5.0:
+                self._audit_drop_warned_at = now
+                self.log_structured(
+                    "warning", "audit_queue_overflow",
+                    dropped_total=self._audit_dropped,
+                    queue_max=AUDIT_QUEUE_MAX
+                )
+            return None
+
+        log_entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": "INFO",
+            "event": _audit_event(event),
             **kwargs
-        )
+        }
+        self._audit_queue.put(log_entry)
+        return log_entry
     
     def get_recent_logs(self, limit: int = 100) -> list:
         """Get recent structured logs"""
-        return self.json_logs[-limit:] if limit > 0 else self.json_logs
+        if limit <= 0:
+            return list(self.json_logs)
+        return list(itertools.islice(
+            self.json_logs, max(0, len(self.json_logs) - limit), None
+        ))
 
 # Global logger instance
 logger = StructuredLogger("devops_agent", "devops_agent.log")
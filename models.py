@@ -30,7 +30,9 @@ class AuthResponse(BaseModel):
     expires_at: Optional[datetime] = None
 
 class CommandRequest(BaseModel):
-    session_id: str
+    # The query-string session_id is authoritative; the endpoint stamps it
+    # onto the model, so request bodies may omit it
+    session_id: str = ""
     command: str
     args: List[str] = []
     environment: Dict[str, str] = {}
@@ -7,20 +7,31 @@ import sys
 import argparse
 from client import DevOpsTerminalClient
 from config import CLIENT_HOST, CLIENT_PORT
+from models import AuthMethod
 
 def main():
     """Launch the DevOps Agent client"""
     parser = argparse.ArgumentParser(description="DevOps Agent Terminal Client")
     parser.add_argument("--host", default=CLIENT_HOST, 
                        help=f"Server host (default: {CLIENT_HOST})")
-    parser.add_argument("--port", type=int, default=CLIENT_PORT, 
+    parser.add_argument("--port", type=int, default=CLIENT_PORT,
                        help=f"Server port (default: {CLIENT_PORT})")
-    
+    parser.add_argument("--auth-method", choices=[m.value for m in AuthMethod],
+                       help="Authentication method for non-interactive login")
+    parser.add_argument("--credentials",
+                       help="SSH public key or API token for non-interactive login")
+    parser.add_argument("--username",
+                       help="Username for non-interactive login")
+
     args = parser.parse_args()
-    
+
     try:
         client = DevOpsTerminalClient(host=args.host, port=args.port)
-        client.run()
+        client.run(
+            auth_method=AuthMethod(args.auth_method) if args.auth_method else None,
+            credentials=args.credentials,
+            username=args.username
+        )
     except KeyboardInterrupt:
         print("\n\nGoodbye! 👋")
         sys.exit(0)
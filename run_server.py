@@ -17,6 +17,8 @@ def main():
             host=SERVER_HOST,
             port=SERVER_PORT,
             reload=False,  # Set to True for development
+            loop="uvloop",       # libuv event loop
+            http="httptools",    # C HTTP parser
             log_level="info",
             access_log=True
         )
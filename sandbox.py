@@ -2,32 +2,106 @@
 Sandbox execution environment for the DevOps Agent
 """
 
+import itertools
 import os
-import subprocess
-import shutil
-import tempfile
+import re
+import resource
 import threading
 import time
-import psutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-import signal
 
 from models import CommandRequest, CommandResponse, CommandStatus, SandboxInfo
 from logger import logger
 from config import (
-    SANDBOX_ROOT, MAX_EXECUTION_TIME, MAX_OUTPUT_SIZE, 
-    AVAILABLE_TOOLS, BLOCKED_COMMANDS
+    SANDBOX_ROOT, MAX_EXECUTION_TIME, MAX_OUTPUT_SIZE,
+    AVAILABLE_TOOLS, AVAILABLE_TOOLS_SET, BLOCKED_COMMAND_SET
 )
 
+# Hot-path lookup for the per-command safety check: one compiled regex
+# pass over the string instead of a Python loop
+DANGEROUS_PATTERN_RE = re.compile(r'[>|&;`]|\$\(')
+
+_SIM_PREFIX = "Simulated: "
+
+def _fast_rmtree(path: Path):
+    """Recursively delete a tree with os.scandir
+
+    scandir reuses the directory entry type info, avoiding the per-path
+    stat calls that make shutil.rmtree's pure-Python walk slow.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _fast_rmtree(Path(entry.path))
+                else:
+                    os.unlink(entry.path)
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+
+def _sim_default(command: str, args: List[str]) -> Tuple[str, str, int]:
+    """Fallback simulation output for commands without a canned response"""
+    if not args:
+        return _SIM_PREFIX + command, "", 0
+    return f"{_SIM_PREFIX}{command} {' '.join(args)}", "", 0
+
+def _sim_git_clone(command: str, args: List[str]) -> Tuple[str, str, int]:
+    target = args[1] if len(args) > 1 else "repository"
+    return f"Cloning into '{target}'...\nDone.", "", 0
+
+def _sim_curl(command: str, args: List[str]) -> Tuple[str, str, int]:
+    url = args[0] if args else "http://example.com"
+    return f"Simulated HTTP GET to {url}\nStatus: 200 OK\nContent: Sample response", "", 0
+
+# Table-driven simulation: command -> {subcommand -> canned tuple or callable},
+# or a callable for commands that always produce dynamic output. Keyed by ""
+# for bare invocations. Dict probes replace the old if/elif cascade.
+_SIMULATORS = {
+    "git": {
+        "": ("git version 2.34.1", "", 0),
+        "status": ("On branch main\nnothing to commit, working tree clean", "", 0),
+        "clone": _sim_git_clone,
+        "pull": ("Already up to date.", "", 0),
+    },
+    "docker": {
+        "": ("Docker version 20.10.17", "", 0),
+        "ps": ("CONTAINER ID   IMAGE     COMMAND   CREATED   STATUS    PORTS     NAMES", "", 0),
+        "images": ("REPOSITORY    TAG       IMAGE ID       CREATED       SIZE", "", 0),
+    },
+    "kubectl": {
+        "": ("kubectl controls the Kubernetes cluster manager.", "", 0),
+        "get": ("No resources found in default namespace.", "", 0),
+    },
+    "terraform": {
+        "": ("Terraform v1.0.0", "", 0),
+        "plan": ("No changes. Infrastructure is up-to-date.", "", 0),
+        "apply": ("Apply complete! Resources: 0 added, 0 changed, 0 destroyed.", "", 0),
+    },
+    "curl": _sim_curl,
+}
+
 class SandboxManager:
     """Manages sandboxed execution of DevOps commands"""
     
     def __init__(self):
         self.active_sandboxes: Dict[str, SandboxInfo] = {}
-        self.command_history: Dict[str, List[CommandResponse]] = {}
-        
+        self.command_history: Dict[str, deque] = {}
+
+        # Guards registration/removal in the two dicts above; the hot path
+        # only takes the per-session lock so requests for different
+        # sessions never contend
+        self._global_lock = threading.Lock()
+        self._session_locks: Dict[str, threading.Lock] = {}
+
+        # Sandbox directories are deleted off-thread so logout and
+        # shutdown don't block on filesystem teardown
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sandbox-rm")
+
         # Ensure sandbox root exists
         SANDBOX_ROOT.mkdir(exist_ok=True)
     
@@ -36,27 +110,41 @@ class SandboxManager:
         sandbox_dir = SANDBOX_ROOT / session_id
         sandbox_dir.mkdir(exist_ok=True)
         
-        # Create basic directory structure
-        (sandbox_dir / "home").mkdir(exist_ok=True)
-        (sandbox_dir / "tmp").mkdir(exist_ok=True)
-        (sandbox_dir / "workspace").mkdir(exist_ok=True)
-        
+        # Create basic directory structure; derive each path string once.
+        # The children are made relative to one open parent fd so the
+        # kernel resolves the sandbox path a single time, not per mkdir.
+        home_dir = sandbox_dir / "home"
+        tmp_dir = sandbox_dir / "tmp"
+        workspace_dir = sandbox_dir / "workspace"
+        parent_fd = os.open(sandbox_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for name in ("home", "tmp", "workspace"):
+                try:
+                    os.mkdir(name, 0o755, dir_fd=parent_fd)
+                except FileExistsError:
+                    pass
+        finally:
+            os.close(parent_fd)
+        workspace_str = str(workspace_dir)
+
         # Create a minimal environment
         env_vars = {
-            "HOME": str(sandbox_dir / "home"),
-            "TMPDIR": str(sandbox_dir / "tmp"),
+            "HOME": str(home_dir),
+            "TMPDIR": str(tmp_dir),
             "USER": username,
-            "PWD": str(sandbox_dir / "workspace"),
+            "PWD": workspace_str,
             "PATH": "/usr/local/bin:/usr/bin:/bin",
             "SHELL": "/bin/bash",
             "TERM": "xterm-256color"
         }
-        
+
         sandbox_info = SandboxInfo(
             session_id=session_id,
-            working_directory=str(sandbox_dir / "workspace"),
+            working_directory=workspace_str,
             environment_variables=env_vars,
-            available_tools=AVAILABLE_TOOLS.copy(),
+            # Shared config list; pydantic validation makes the per-model
+            # copy, so the explicit one here was redundant
+            available_tools=AVAILABLE_TOOLS,
             resource_limits={
                 "max_execution_time": MAX_EXECUTION_TIME,
                 "max_output_size": MAX_OUTPUT_SIZE,
@@ -66,8 +154,11 @@ class SandboxManager:
             created_at=datetime.utcnow()
         )
         
-        self.active_sandboxes[session_id] = sandbox_info
-        self.command_history[session_id] = []
+        with self._global_lock:
+            self.active_sandboxes[session_id] = sandbox_info
+            # Bounded ring buffer: append evicts the oldest entry in O(1)
+            self.command_history[session_id] = deque(maxlen=100)
+            self._session_locks[session_id] = threading.Lock()
         
         logger.audit(
             "sandbox_created",
@@ -83,87 +174,52 @@ class SandboxManager:
     
     def _is_command_safe(self, command: str) -> Tuple[bool, str]:
         """Check if a command is safe to execute"""
+        # Scan for shell metacharacters before tokenizing, so commands on
+        # the common rejection path are refused without the strip/split
+        # allocations
+        match = DANGEROUS_PATTERN_RE.search(command)
+        if match:
+            return False, f"Command contains potentially dangerous pattern: {match.group(0)}"
+
         cmd_parts = command.strip().split()
         if not cmd_parts:
             return False, "Empty command"
-        
+
         base_command = cmd_parts[0].lower()
-        
+
         # Check blocked commands
-        if base_command in BLOCKED_COMMANDS:
+        if base_command in BLOCKED_COMMAND_SET:
             return False, f"Command '{base_command}' is blocked for security reasons"
-        
+
         # Check if it's a known safe tool
-        if base_command not in AVAILABLE_TOOLS:
+        if base_command not in AVAILABLE_TOOLS_SET:
             return False, f"Command '{base_command}' is not available in sandbox"
-        
-        # Additional safety checks
-        dangerous_patterns = ['>', '>>', '|', '&', ';', '$(', '`']
-        for pattern in dangerous_patterns:
-            if pattern in command:
-                return False, f"Command contains potentially dangerous pattern: {pattern}"
-        
+
         return True, "Command is safe"
     
     def _simulate_devops_command(self, command: str, args: List[str]) -> Tuple[str, str, int]:
-        """Simulate DevOps commands safely"""
-        cmd_lower = command.lower()
-        
-        if cmd_lower == "git":
-            if not args:
-                return "git version 2.34.1", "", 0
-            elif args[0] == "status":
-                return "On branch main\nnothing to commit, working tree clean", "", 0
-            elif args[0] == "clone":
-                return f"Cloning into '{args[1] if len(args) > 1 else 'repository'}'...\nDone.", "", 0
-            elif args[0] == "pull":
-                return "Already up to date.", "", 0
-            else:
-                return f"Simulated: git {' '.join(args)}", "", 0
-        
-        elif cmd_lower == "docker":
-            if not args:
-                return "Docker version 20.10.17", "", 0
-            elif args[0] == "ps":
-                return "CONTAINER ID   IMAGE     COMMAND   CREATED   STATUS    PORTS     NAMES", "", 0
-            elif args[0] == "images":
-                return "REPOSITORY    TAG       IMAGE ID       CREATED       SIZE", "", 0
-            else:
-                return f"Simulated: docker {' '.join(args)}", "", 0
-        
-        elif cmd_lower == "kubectl":
-            if not args:
-                return "kubectl controls the Kubernetes cluster manager.", "", 0
-            elif args[0] == "get":
-                return "No resources found in default namespace.", "", 0
-            else:
-                return f"Simulated: kubectl {' '.join(args)}", "", 0
-        
-        elif cmd_lower == "terraform":
-            if not args:
-                return "Terraform v1.0.0", "", 0
-            elif args[0] == "plan":
-                return "No changes. Infrastructure is up-to-date.", "", 0
-            elif args[0] == "apply":
-                return "Apply complete! Resources: 0 added, 0 changed, 0 destroyed.", "", 0
-            else:
-                return f"Simulated: terraform {' '.join(args)}", "", 0
-        
-        elif cmd_lower == "curl":
-            url = args[0] if args else "http://example.com"
-            return f"Simulated HTTP GET to {url}\nStatus: 200 OK\nContent: Sample response", "", 0
-        
-        elif cmd_lower in ["ls", "pwd", "cat", "grep", "find"]:
-            # Use actual system commands for basic file operations (safe in isolated directory)
-            return f"Simulated: {command} {' '.join(args)}", "", 0
-        
-        else:
-            return f"Simulated: {command} {' '.join(args)}", "", 0
+        """Simulate DevOps commands safely via the precomputed dispatch table"""
+        handler = _SIMULATORS.get(command.lower())
+        if handler is None:
+            return _sim_default(command, args)
+
+        if callable(handler):
+            return handler(command, args)
+
+        entry = handler.get(args[0] if args else "")
+        if entry is None:
+            return _sim_default(command, args)
+
+        if callable(entry):
+            return entry(command, args)
+
+        return entry
     
     def execute_command(self, session_id: str, request: CommandRequest) -> CommandResponse:
         """Execute a command in the sandbox"""
-        command_id = f"cmd_{session_id}_{int(time.time())}"
-        start_time = time.time()
+        # Nanosecond id: cheaper than datetime and unique within a session
+        command_id = f"cmd_{session_id}_{time.time_ns()}"
+        start_ns = time.monotonic_ns()
         
         # Validate session has sandbox
         sandbox = self.get_sandbox(session_id)
@@ -193,7 +249,7 @@ class SandboxManager:
                 stdout="",
                 stderr=f"Command blocked: {safety_message}",
                 exit_code=1,
-                execution_time=time.time() - start_time,
+                execution_time=(time.monotonic_ns() - start_ns) / 1e9,
                 timestamp=datetime.utcnow()
             )
         
@@ -206,13 +262,18 @@ class SandboxManager:
         )
         
         try:
+            # One syscall on each side of the execution; the delta gives
+            # real per-command figures once commands stop being simulated
+            usage_before = resource.getrusage(resource.RUSAGE_THREAD)
+
             # Execute command in simulation mode
             stdout, stderr, exit_code = self._simulate_devops_command(
-                request.command, 
+                request.command,
                 request.args
             )
-            
-            execution_time = time.time() - start_time
+
+            usage_after = resource.getrusage(resource.RUSAGE_THREAD)
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
             status = CommandStatus.COMPLETED if exit_code == 0 else CommandStatus.FAILED
             
             response = CommandResponse(
@@ -223,19 +284,23 @@ class SandboxManager:
                 exit_code=exit_code,
                 execution_time=execution_time,
                 timestamp=datetime.utcnow(),
+                # Raw numbers, not formatted strings; the response encoder
+                # serializes them and callers can format as they like
                 resource_usage={
-                    "cpu_time": execution_time,
-                    "memory_peak": "< 1MB",
-                    "disk_io": "minimal"
+                    "cpu_time": (usage_after.ru_utime - usage_before.ru_utime)
+                                + (usage_after.ru_stime - usage_before.ru_stime),
+                    "memory_peak_kb": usage_after.ru_maxrss,
+                    "block_io": (usage_after.ru_inblock - usage_before.ru_inblock)
+                                + (usage_after.ru_oublock - usage_before.ru_oublock)
                 }
             )
             
-            # Store command history
-            if session_id in self.command_history:
-                self.command_history[session_id].append(response)
-                # Keep only last 100 commands
-                if len(self.command_history[session_id]) > 100:
-                    self.command_history[session_id] = self.command_history[session_id][-100:]
+            # Store command history; the deque caps it at 100 entries
+            session_lock = self._session_locks.get(session_id)
+            history = self.command_history.get(session_id)
+            if session_lock and history is not None:
+                with session_lock:
+                    history.append(response)
             
             logger.audit(
                 "command_execution_completed",
@@ -249,7 +314,7 @@ class SandboxManager:
             return response
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = (time.monotonic_ns() - start_ns) / 1e9
             error_response = CommandResponse(
                 command_id=command_id,
                 status=CommandStatus.FAILED,
@@ -275,29 +340,47 @@ class SandboxManager:
             return []
         
         history = self.command_history[session_id]
-        return history[-limit:] if limit > 0 else history
+        # Common case: the whole (bounded) history fits in the limit, so a
+        # straight C-level copy beats setting up an islice window
+        if limit <= 0 or limit >= len(history):
+            return list(history)
+        return list(itertools.islice(history, len(history) - limit, None))
     
+    def _remove_sandbox_dir(self, session_id: str, sandbox_dir: Path):
+        """Background removal of a sandbox directory tree"""
+        try:
+            _fast_rmtree(sandbox_dir)
+        except Exception as e:
+            logger.error(
+                "sandbox_cleanup_failed",
+                session_id=session_id,
+                error=str(e)
+            )
+
     def cleanup_sandbox(self, session_id: str) -> bool:
         """Clean up sandbox environment"""
         if session_id not in self.active_sandboxes:
             return False
-        
+
         try:
+            # Drop the session from the registry first so further requests
+            # see it as gone, then delete the tree off the request thread
+            with self._global_lock:
+                self.active_sandboxes.pop(session_id, None)
+                self.command_history.pop(session_id, None)
+                self._session_locks.pop(session_id, None)
+
             sandbox_dir = SANDBOX_ROOT / session_id
             if sandbox_dir.exists():
-                shutil.rmtree(sandbox_dir)
-            
-            del self.active_sandboxes[session_id]
-            if session_id in self.command_history:
-                del self.command_history[session_id]
-            
+                self._cleanup_pool.submit(self._remove_sandbox_dir, session_id, sandbox_dir)
+
             logger.audit(
                 "sandbox_cleaned_up",
                 session_id=session_id
             )
-            
+
             return True
-            
+
         except Exception as e:
             logger.error(
                 "sandbox_cleanup_failed",
@@ -2,8 +2,15 @@
 FastAPI server for the DevOps Agent
 """
 
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 import uvicorn
 
@@ -19,7 +26,10 @@ from config import SERVER_HOST, SERVER_PORT
 app = FastAPI(
     title="DevOps Terminal Agent",
     description="A sandboxed environment for safe DevOps operations",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes responses in C, including datetimes; matters most
+    # for /commands/history payloads of up to 100 responses
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -31,6 +41,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Short-TTL cache for the admin endpoints, so periodic monitoring polls
+# don't re-walk all sessions/logs on every scrape. The lock coalesces
+# concurrent misses into a single rebuild. Bounded so varied query
+# parameters (e.g. /admin/logs limits) can't grow it without limit.
+ADMIN_CACHE_TTL = 1.0
+ADMIN_CACHE_MAX = 4
+_admin_cache: dict = {}
+_admin_cache_lock = asyncio.Lock()
+
+async def _cached_admin_response(key: str, build):
+    """Return a cached admin payload, rebuilding it at most once per TTL"""
+    now = time.monotonic()
+    entry = _admin_cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    async with _admin_cache_lock:
+        entry = _admin_cache.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+        value = build()
+        _admin_cache[key] = (now + ADMIN_CACHE_TTL, value)
+        if len(_admin_cache) > ADMIN_CACHE_MAX:
+            # Drop expired entries first, then the oldest inserts; dicts
+            # iterate in insertion order so the front is the oldest
+            for stale in [k for k, (deadline, _) in _admin_cache.items() if deadline <= now]:
+                del _admin_cache[stale]
+            while len(_admin_cache) > ADMIN_CACHE_MAX:
+                del _admin_cache[next(iter(_admin_cache))]
+        return value
+
 def get_current_session(session_id: str):
     """Dependency to validate session"""
     session = auth_manager.validate_session(session_id)
@@ -117,11 +158,20 @@ async def execute_command(
 ):
     """Execute a command in the sandbox"""
     try:
-        # Ensure the session_id matches
-        if command_request.session_id != session_id:
-            raise HTTPException(status_code=400, detail="Session ID mismatch")
-        
-        response = sandbox_manager.execute_command(session_id, command_request)
+        # The validated query session_id is authoritative; stamping it here
+        # replaces the old mismatch check, so a stale or missing body value
+        # can never address another session's sandbox
+        command_request.session_id = session_id
+
+        # Run the sync execution path in the bounded worker pool so it
+        # doesn't block the event loop
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            app.state.cmd_pool,
+            sandbox_manager.execute_command,
+            session_id,
+            command_request
+        )
         return response
     except HTTPException:
         raise
@@ -151,8 +201,10 @@ async def get_active_sessions(session_id: str, session: dict = Depends(get_curre
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        sessions = auth_manager.get_active_sessions()
-        return {"active_sessions": sessions}
+        return await _cached_admin_response(
+            "sessions",
+            lambda: {"active_sessions": auth_manager.get_active_sessions()}
+        )
     except Exception as e:
         logger.error("Admin sessions error", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get sessions")
@@ -168,8 +220,10 @@ async def get_logs(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        logs = logger.get_recent_logs(limit)
-        return {"logs": logs}
+        return await _cached_admin_response(
+            f"logs:{limit}",
+            lambda: {"logs": logger.get_recent_logs(limit)}
+        )
     except Exception as e:
         logger.error("Admin logs error", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get logs")
@@ -179,14 +233,44 @@ async def startup_event():
     """Initialize the server"""
     logger.info("DevOps Agent server starting up")
 
+    # Bounded pool for command execution: offloads sync work from the
+    # event loop and caps how many commands can run at once
+    app.state.cmd_pool = ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="cmd"
+    )
+
+    # Pre-provisioned worker processes for when command execution stops
+    # being simulated: paying fork+exec once at startup instead of per
+    # request. forkserver children don't re-import the FastAPI app.
+    exec_workers = os.cpu_count() or 1
+    app.state.exec_pool = ProcessPoolExecutor(
+        max_workers=exec_workers,
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+    # The executor spawns workers lazily on first submit; run one no-op
+    # per worker now so the processes exist before traffic arrives
+    for future in [app.state.exec_pool.submit(os.getpid) for _ in range(exec_workers)]:
+        future.result()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on server shutdown"""
     logger.info("DevOps Agent server shutting down")
-    
-    # Cleanup all active sandboxes
-    for session_id in list(sandbox_manager.active_sandboxes.keys()):
-        sandbox_manager.cleanup_sandbox(session_id)
+
+    # Cleanup all active sandboxes concurrently; teardown is IO-bound
+    # directory removal, so the threads overlap instead of paying
+    # N sequential rmtree latencies
+    sessions = list(sandbox_manager.active_sandboxes.keys())
+    if sessions:
+        with ThreadPoolExecutor(
+            max_workers=min(16, len(sessions)),
+            thread_name_prefix="shutdown-rm"
+        ) as pool:
+            list(pool.map(sandbox_manager.cleanup_sandbox, sessions))
+
+    app.state.cmd_pool.shutdown(wait=False, cancel_futures=True)
+    app.state.exec_pool.shutdown(wait=False, cancel_futures=True)
 
 def create_app():
     """Create and configure the FastAPI app"""
@@ -197,6 +281,7 @@ if __name__ == "__main__":
         "server:app",
         host=SERVER_HOST,
         port=SERVER_PORT,
-        reload=True,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )